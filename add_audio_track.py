@@ -13,7 +13,7 @@ from typing import Optional, Dict, Any, List
 from pyJianYingDraft import Draft, AudioSegment, Effect
 from pyJianYingDraft.utils import generate_uuid, format_duration
 import logging
-import requests
+from utils import http_session
 
 logger = logging.getLogger(__name__)
 
@@ -100,7 +100,7 @@ def add_audio_track(
             audio_path = os.path.join(draft_folder, "audios", audio_filename)
             
             try:
-                response = requests.get(audio_url, stream=True)
+                response = http_session.get(audio_url, stream=True)
                 response.raise_for_status()
                 
                 os.makedirs(os.path.dirname(audio_path), exist_ok=True)
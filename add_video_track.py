@@ -105,12 +105,12 @@ def add_video_track(
         video_path = video_url
         if video_url.startswith('http'):
             # 下载视频文件
-            import requests
+            from utils import http_session
             video_filename = f"video_{material_id}.mp4"
             video_path = os.path.join(draft_folder, "videos", video_filename)
             
             try:
-                response = requests.get(video_url, stream=True)
+                response = http_session.get(video_url, stream=True)
                 response.raise_for_status()
                 
                 with open(video_path, 'wb') as f:
@@ -11,31 +11,86 @@ import json
 import traceback
 import io
 import contextlib
-from typing import Any, Dict, List, Optional
+import asyncio
+import threading
+import functools
+import importlib
+from typing import Any, Dict, List, Optional, Tuple
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MethodType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+# 设置CAPCUT_MCP_DEBUG=1时在错误响应中附带调用栈
+_DEBUG = os.getenv("CAPCUT_MCP_DEBUG") == "1"
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# 导入CapCut API功能
-try:
-    from create_draft import get_or_create_draft
-    from add_text_impl import add_text_impl
-    from add_video_track import add_video_track
-    from add_audio_track import add_audio_track
-    from add_image_impl import add_image_impl
-    from add_subtitle_impl import add_subtitle_impl
-    from add_effect_impl import add_effect_impl
-    from add_sticker_impl import add_sticker_impl
-    from add_video_keyframe_impl import add_video_keyframe_impl
-    from get_duration_impl import get_video_duration
-    from save_draft_impl import save_draft_impl
-    from pyJianYingDraft.text_segment import TextStyleRange
-
-    CAPCUT_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Could not import CapCut modules: {e}", file=sys.stderr)
-    CAPCUT_AVAILABLE = False
+# CapCut API功能模块按需导入，只用到部分工具时无需加载全部模块
+_IMPL_MODULES = (
+    "create_draft",
+    "add_text_impl",
+    "add_video_track",
+    "add_audio_track",
+    "add_image_impl",
+    "add_subtitle_impl",
+    "add_effect_impl",
+    "add_sticker_impl",
+    "save_draft_impl",
+    "pyJianYingDraft.text_segment",
+    "utils",
+)
+_IMPL: Dict[str, Any] = {}
+
+
+def _impl(module_name: str):
+    """导入CapCut功能模块并缓存"""
+    module = _IMPL.get(module_name)
+    if module is None:
+        module = _IMPL[module_name] = importlib.import_module(module_name)
+    return module
+
+
+def preload_impls() -> bool:
+    """预先导入全部CapCut功能模块，常驻进程模式下使用"""
+    try:
+        for module_name in _IMPL_MODULES:
+            _impl(module_name)
+    except ImportError as e:
+        print(f"Warning: Could not import CapCut modules: {e}", file=sys.stderr)
+        return False
+    return True
+
+
+if os.getenv("CAPCUT_MCP_PRELOAD") == "1":
+    preload_impls()
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """将结果序列化为UTF-8编码的JSON字节串，供直接写入socket等字节通道使用"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def json_dumps(obj: Any) -> str:
+    """将结果序列化为JSON字符串，优先使用orjson，无法序列化的对象转为字符串"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, default=str, option=orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, default=str)
+
 
 # 完整的工具定义
 TOOLS = [
@@ -461,63 +516,387 @@ TOOLS = [
             "required": ["sticker_url"],
         },
     },
+    {
+        "name": "add_media_batch",
+        "description": "批量添加视频、音频、图片、贴纸到草稿，各素材并发处理",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "draft_id": {"type": "string", "description": "草稿ID（素材未指定时使用）"},
+                "items": {
+                    "type": "array",
+                    "description": "素材列表，每项包含type及对应add_*工具的参数",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "type": {
+                                "type": "string",
+                                "enum": ["video", "audio", "image", "sticker"],
+                                "description": "素材类型",
+                            },
+                        },
+                        "required": ["type"],
+                    },
+                },
+            },
+            "required": ["items"],
+        },
+    },
     {
         "name": "save_draft",
-        "description": "保存草稿并生成最终视频",
+        "description": "保存草稿并生成最终视频，后台执行并返回job_id，通过get_save_status查询结果",
         "inputSchema": {
             "type": "object",
             "properties": {"draft_id": {"type": "string", "description": "草稿ID"}},
             "required": ["draft_id"],
         },
     },
+    {
+        "name": "get_save_status",
+        "description": "查询草稿保存任务的状态，任务完成或失败的结果只返回一次",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "job_id": {"type": "string", "description": "save_draft返回的任务ID"}
+            },
+            "required": ["job_id"],
+        },
+    },
 ]
 
+# add_media_batch中各素材类型对应的URL参数
+_MEDIA_URL_FIELDS = {
+    "video": "video_url",
+    "audio": "audio_url",
+    "image": "image_url",
+    "sticker": "sticker_url",
+}
+
+# 任务表中最多保留的保存任务数，超出时清理未被查询的已结束任务
+_MAX_SAVE_JOBS = 1024
+
+# 素材URL参数 -> (草稿内存放素材的子目录, URL没有扩展名时使用的默认扩展名)
+_MEDIA_SUBDIRS = {
+    "video_url": ("videos", ".mp4"),
+    "audio_url": ("audios", ".mp3"),
+    "image_url": ("images", ".png"),
+    "sticker_url": ("stickers", ".png"),
+}
+
+_TOOL_SCHEMAS = {tool["name"]: tool["inputSchema"] for tool in TOOLS}
+
+
+@functools.lru_cache(maxsize=None)
+def _validator(name: str):
+    """按工具名编译参数校验函数，首次调用该工具时编译并缓存
+
+    默认值由分发函数处理，校验时不填充；未安装fastjsonschema时返回None
+    """
+    schema = _TOOL_SCHEMAS.get(name)
+    if fastjsonschema is None or schema is None:
+        return None
+    return fastjsonschema.compile(schema, use_default=False)
+
+
+# 工具定义在运行期间不会变化，预先序列化一次
+_TOOLS_JSON_BYTES = json_dumps_bytes(TOOLS)
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_models():
+    """将工具定义校验为MCP的Tool模型，只在首次调用时执行一次"""
+    from mcp.types import Tool
+
+    return [Tool.model_validate(tool) for tool in TOOLS]
+
+
+def _fetch_media(url: str, draft_folder: str, url_field: str) -> str:
+    """获取素材并放入草稿的素材目录，返回草稿内的本地路径
+
+    下载经本地缓存去重，缓存文件再硬链接（无法链接时复制）到草稿目录，
+    草稿不依赖缓存目录，缓存被清理或草稿被拷贝后仍可使用
+    """
+    subdir, default_ext = _MEDIA_SUBDIRS[url_field]
+    return _impl("utils").fetch_into(
+        url, os.path.join(draft_folder, subdir), default_ext
+    )
+
+
+def _text_style_ranges(styles: Optional[List[Dict[str, Any]]]):
+    """将文本多样式配置转换为TextStyleRange列表，未配置时返回None"""
+    if not styles:
+        return None
+    # 每次调用都构造新的对象：实现模块可能修改传入的样式对象，不能在调用之间共享
+    text_style_range = _impl("pyJianYingDraft.text_segment").TextStyleRange
+    return [text_style_range(**style) for style in styles]
+
+
+# 添加类工具的生成规则：工具名 -> (实现模块, 实现函数, 需下载的URL参数, 参数映射)
+# 参数映射中字符串表示同名透传，(参数名, 表达式)中的{name}会替换为读取该工具参数的代码
+# fmt: off
+_DISPATCHER_SPECS = {
+    "add_video": (
+        "add_video_track",
+        "add_video_track",
+        "video_url",
+        [
+            "video_url", "start", "end", "target_start", "width", "height",
+            "transform_x", "transform_y", "scale_x", "scale_y", "speed",
+            "track_name", "volume", "transition", "transition_duration",
+            "mask_type", "background_blur",
+        ],
+    ),
+    "add_audio": (
+        "add_audio_track",
+        "add_audio_track",
+        "audio_url",
+        [
+            "audio_url", "start", "end", "target_start", "volume", "speed",
+            "track_name", "width", "height",
+        ],
+    ),
+    "add_image": (
+        "add_image_impl",
+        "add_image_impl",
+        "image_url",
+        [
+            "image_url", "start", ("duration", "{end} - {start}"), "width",
+            "height", "transform_x", "transform_y", "scale_x", "scale_y",
+            "track_name",
+        ],
+    ),
+    "add_text": (
+        "add_text_impl",
+        "add_text_impl",
+        None,
+        [
+            "text", "start", ("duration", "{end} - {start}"),
+            ("color", "{font_color}"), "font_size", ("track_name", '"text_main"'),
+            "width", "height", ("text_styles", "_text_style_ranges({text_styles})"),
+            "shadow_enabled", "shadow_color", "shadow_alpha", "shadow_angle",
+            "shadow_distance", "shadow_smoothing", "background_color",
+            "background_alpha", "background_style", "background_round_radius",
+        ],
+    ),
+    "add_subtitle": (
+        "add_subtitle_impl",
+        "add_subtitle_impl",
+        None,
+        [
+            "srt_path", "track_name", "time_offset", "font", "font_size",
+            "font_color", "bold", "italic", "underline", "border_width",
+            "border_color", "background_color", "background_alpha",
+            "transform_x", "transform_y", "width", "height",
+        ],
+    ),
+    "add_effect": (
+        "add_effect_impl",
+        "add_effect_impl",
+        None,
+        [
+            "effect_type", "start", ("duration", "{end} - {start}"),
+            "track_name", ("params", "{params} or []"), "width", "height",
+        ],
+    ),
+    "add_sticker": (
+        "add_sticker_impl",
+        "add_sticker_impl",
+        "sticker_url",
+        [
+            "sticker_url", "start", ("duration", "{end} - {start}"), "width",
+            "height", "transform_x", "transform_y", "scale_x", "scale_y",
+            "rotation", "track_name",
+        ],
+    ),
+}
+# fmt: on
+
+_DISPATCHER_TEMPLATE = """
+def {func_name}(self, args):
+    draft_id = args.get("draft_id")
+    index = self._draft_index.get(draft_id)
+    if index is None:
+        return {{"success": False, "error": "Invalid draft_id"}}
+    width, height = self._sizes[index]
+{prepare}    impl = _impl({module!r}).{function}
+    with self._draft_lock(draft_id):
+        result = impl(
+            draft_folder=self._folders[index],
+{kwargs}        )
+    return {{"success": True, "result": result}}
+"""
+
+
+def _build_dispatcher(
+    tool_spec: Dict[str, Any],
+    module: str,
+    function: str,
+    url_field: Optional[str],
+    arg_map: List[Any],
+):
+    """根据工具schema生成特化的分发函数，默认值直接内联为字面量"""
+    schema = tool_spec["inputSchema"]
+    properties = schema["properties"]
+    required = set(schema.get("required", []))
+
+    def read(key: str) -> str:
+        if key == url_field:
+            return key
+        if key in ("width", "height"):
+            # 未指定宽高时使用草稿尺寸
+            return f"args.get({key!r}, {key})"
+        if key in required:
+            return f"args[{key!r}]"
+        if "default" in properties.get(key, {}):
+            return f"args.get({key!r}, {properties[key]['default']!r})"
+        return f"args.get({key!r})"
+
+    class _Reader(dict):
+        def __missing__(self, key):
+            return read(key)
+
+    kwargs = ""
+    for entry in arg_map:
+        param, expr = (entry, "{%s}" % entry) if isinstance(entry, str) else entry
+        kwargs += f"            {param}={expr.format_map(_Reader())},\n"
+
+    prepare = ""
+    if url_field is not None:
+        # 在草稿锁之外下载素材，同一草稿的多个调用可以并行下载
+        prepare = (
+            f"    {url_field} = _fetch_media(\n"
+            f"        args[{url_field!r}], self._folders[index], {url_field!r}\n"
+            f"    )\n"
+        )
+
+    func_name = "_" + tool_spec["name"]
+    source = _DISPATCHER_TEMPLATE.format(
+        func_name=func_name,
+        prepare=prepare,
+        module=module,
+        function=function,
+        kwargs=kwargs,
+    )
+    namespace = {
+        "_impl": _impl,
+        "_fetch_media": _fetch_media,
+        "_text_style_ranges": _text_style_ranges,
+    }
+    exec(compile(source, f"<dispatcher {tool_spec['name']}>", "exec"), namespace)
+
+    dispatcher = namespace[func_name]
+    dispatcher.__doc__ = tool_spec["description"]
+    dispatcher.__qualname__ = f"CapCutMCPServer.{func_name}"
+    return dispatcher
+
+
+_DISPATCHERS = {
+    tool["name"]: _build_dispatcher(tool, *_DISPATCHER_SPECS[tool["name"]])
+    for tool in TOOLS
+    if tool["name"] in _DISPATCHER_SPECS
+}
+
 
 class CapCutMCPServer:
     def __init__(self):
         self.name = "capcut-api"
         self.version = "1.0.0"
-        self.drafts = {}
+        # 草稿信息按列存储：草稿ID -> 下标，文件夹与宽高分别存放在并列的列表中
+        self._draft_index: Dict[str, int] = {}
+        self._folders: List[str] = []
+        self._sizes: List[Tuple[int, int]] = []
+        self._drafts_guard = threading.Lock()
+        # 工具调用在有界线程池中执行，同时限制并发数量
+        self._tool_executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="capcut-tool"
+        )
+        # 每个草稿一把锁，避免并发调用同时读写同一个草稿文件
+        # 值为[锁, 使用计数]，没有调用使用时移除，字典只保留正在处理的草稿
+        self._draft_locks: Dict[str, List[Any]] = {}
+        self._draft_locks_guard = threading.Lock()
+        # 草稿保存在后台线程中执行
+        self._save_executor = ThreadPoolExecutor(max_workers=2)
+        self._jobs: Dict[str, Future] = {}
+        self._jobs_guard = threading.Lock()
+        # 工具名到处理函数的映射
+        self._dispatch = {
+            "create_draft": self._create_draft,
+            "add_media_batch": self._add_media_batch,
+            "save_draft": self._save_draft,
+            "get_save_status": self._get_save_status,
+        }
+        # add_*工具的分发函数在导入时根据schema生成
+        for name, dispatcher in _DISPATCHERS.items():
+            self._dispatch[name] = MethodType(dispatcher, self)
 
     def get_tools(self):
         """返回可用的工具列表"""
         return TOOLS
 
+    def get_tool_models(self):
+        """返回已校验的MCP工具模型列表，供list_tools处理函数直接返回"""
+        return _tool_models()
+
+    def get_tools_json(self) -> bytes:
+        """返回预先序列化好的工具列表JSON"""
+        return _TOOLS_JSON_BYTES
+
     def call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """调用指定的工具"""
-        if not CAPCUT_AVAILABLE:
-            return {
-                "success": False,
-                "error": "CapCut modules not available. Please check installation.",
-            }
-
         try:
-            if name == "create_draft":
-                return self._create_draft(arguments)
-            elif name == "add_video":
-                return self._add_video(arguments)
-            elif name == "add_audio":
-                return self._add_audio(arguments)
-            elif name == "add_image":
-                return self._add_image(arguments)
-            elif name == "add_text":
-                return self._add_text(arguments)
-            elif name == "add_subtitle":
-                return self._add_subtitle(arguments)
-            elif name == "add_effect":
-                return self._add_effect(arguments)
-            elif name == "add_sticker":
-                return self._add_sticker(arguments)
-            elif name == "save_draft":
-                return self._save_draft(arguments)
-            else:
+            handler = self._dispatch.get(name)
+            if handler is None:
                 return {"success": False, "error": f"Unknown tool: {name}"}
-        except Exception as e:
+
+            validate = _validator(name)
+            if validate is not None:
+                try:
+                    validate(arguments)
+                except fastjsonschema.JsonSchemaException as e:
+                    return {
+                        "success": False,
+                        "error": f"Invalid arguments: {e.message}",
+                    }
+
+            return handler(arguments)
+        except ImportError as e:
             return {
                 "success": False,
-                "error": str(e),
-                "traceback": traceback.format_exc(),
+                "error": f"CapCut modules not available: {e}",
             }
+        except Exception as e:
+            response = {"success": False, "error": str(e)}
+            if _DEBUG:
+                response["traceback"] = traceback.format_exc()
+            return response
+
+    def call_tool_json(self, name: str, arguments: Dict[str, Any]) -> str:
+        """调用工具并返回序列化后的JSON文本"""
+        return json_dumps(self.call_tool(name, arguments))
+
+    async def call_tool_json_async(self, name: str, arguments: Dict[str, Any]) -> str:
+        """在线程池中调用工具并完成序列化，事件循环只负责转发结果文本"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._tool_executor, self.call_tool_json, name, arguments
+        )
+
+    @contextlib.contextmanager
+    def _draft_lock(self, draft_id: str):
+        """持有草稿对应的锁，最后一个使用者释放后移除该锁"""
+        with self._draft_locks_guard:
+            entry = self._draft_locks.get(draft_id)
+            if entry is None:
+                entry = self._draft_locks[draft_id] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._draft_locks_guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._draft_locks[draft_id]
 
     def _create_draft(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """创建新的草稿"""
@@ -525,13 +904,14 @@ class CapCutMCPServer:
         height = args.get("height", 1920)
 
         draft_id = str(uuid.uuid4())
-        draft_folder = get_or_create_draft(draft_id, width, height)
+        draft_folder = _impl("create_draft").get_or_create_draft(
+            draft_id, width, height
+        )
 
-        self.drafts[draft_id] = {
-            "folder": draft_folder,
-            "width": width,
-            "height": height,
-        }
+        with self._drafts_guard:
+            self._draft_index[draft_id] = len(self._folders)
+            self._folders.append(draft_folder)
+            self._sizes.append((width, height))
 
         return {
             "success": True,
@@ -541,311 +921,143 @@ class CapCutMCPServer:
             "height": height,
         }
 
-    def _add_video(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """添加视频到草稿"""
+    def _add_media_batch(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """批量添加素材到草稿"""
         draft_id = args.get("draft_id")
-        if not draft_id or draft_id not in self.drafts:
-            return {"success": False, "error": "Invalid draft_id"}
+        items = args["items"]
 
-        draft_folder = self.drafts[draft_id]["folder"]
-
-        result = add_video_track(
-            draft_folder=draft_folder,
-            video_url=args["video_url"],
-            start=args.get("start", 0),
-            end=args.get("end"),
-            target_start=args.get("target_start", 0),
-            width=args.get("width", 1080),
-            height=args.get("height", 1920),
-            transform_x=args.get("transform_x", 0),
-            transform_y=args.get("transform_y", 0),
-            scale_x=args.get("scale_x", 1),
-            scale_y=args.get("scale_y", 1),
-            speed=args.get("speed", 1.0),
-            track_name=args.get("track_name", "main"),
-            volume=args.get("volume", 1.0),
-            transition=args.get("transition"),
-            transition_duration=args.get("transition_duration", 0.5),
-            mask_type=args.get("mask_type"),
-            background_blur=args.get("background_blur"),
-        )
+        # 先并发下载全部素材到本地缓存，相同URL只下载一次；
+        # 各素材的调用再从缓存链接到草稿目录，不会重复下载
+        urls = {}
+        for item in items:
+            field = _MEDIA_URL_FIELDS.get(item.get("type"))
+            if field and isinstance(item.get(field), str):
+                urls[item[field]] = _MEDIA_SUBDIRS[field][1]
 
-        return {"success": True, "result": result}
+        def prefetch(url: str) -> None:
+            try:
+                # 与各素材调用使用相同的默认扩展名，确保命中同一个缓存文件
+                _impl("utils").cached_fetch(url, urls[url])
+            except Exception:
+                # 下载失败时由对应素材的调用重试并返回错误
+                pass
 
-    def _add_audio(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """添加音频到草稿"""
-        draft_id = args.get("draft_id")
-        if not draft_id or draft_id not in self.drafts:
-            return {"success": False, "error": "Invalid draft_id"}
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(prefetch, urls))
 
-        draft_folder = self.drafts[draft_id]["folder"]
-
-        result = add_audio_track(
-            draft_folder=draft_folder,
-            audio_url=args["audio_url"],
-            start=args.get("start", 0),
-            end=args.get("end"),
-            target_start=args.get("target_start", 0),
-            volume=args.get("volume", 1.0),
-            speed=args.get("speed", 1.0),
-            track_name=args.get("track_name", "audio_main"),
-            width=args.get("width", 1080),
-            height=args.get("height", 1920),
-        )
+        def add_item(item: Dict[str, Any]) -> Dict[str, Any]:
+            item_args = dict(item)
+            media_type = item_args.pop("type", None)
+            field = _MEDIA_URL_FIELDS.get(media_type)
+            if field is None:
+                return {"success": False, "error": f"Unknown media type: {media_type}"}
+            if draft_id is not None:
+                item_args.setdefault("draft_id", draft_id)
+            return self.call_tool(f"add_{media_type}", item_args)
 
-        return {"success": True, "result": result}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(add_item, items))
 
-    def _add_image(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """添加图片到草稿"""
-        draft_id = args.get("draft_id")
-        if not draft_id or draft_id not in self.drafts:
-            return {"success": False, "error": "Invalid draft_id"}
-
-        draft_folder = self.drafts[draft_id]["folder"]
-
-        result = add_image_impl(
-            draft_folder=draft_folder,
-            image_url=args["image_url"],
-            start=args.get("start", 0),
-            duration=args.get("end", 3.0) - args.get("start", 0),
-            width=args.get("width", 1080),
-            height=args.get("height", 1920),
-            transform_x=args.get("transform_x", 0),
-            transform_y=args.get("transform_y", 0),
-            scale_x=args.get("scale_x", 1),
-            scale_y=args.get("scale_y", 1),
-            track_name=args.get("track_name", "main"),
-        )
-
-        return {"success": True, "result": result}
-
-    def _add_text(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """添加文本到草稿"""
-        draft_id = args.get("draft_id")
-        if not draft_id or draft_id not in self.drafts:
-            return {"success": False, "error": "Invalid draft_id"}
-
-        draft_folder = self.drafts[draft_id]["folder"]
-
-        # 处理文本多样式
-        text_styles = []
-        if "text_styles" in args:
-            for style in args["text_styles"]:
-                text_styles.append(TextStyleRange(**style))
-
-        result = add_text_impl(
-            draft_folder=draft_folder,
-            text=args["text"],
-            start=args["start"],
-            duration=args["end"] - args["start"],
-            color=args.get("font_color", "#ffffff"),
-            font_size=args.get("font_size", 24),
-            track_name="text_main",
-            width=args.get("width", 1080),
-            height=args.get("height", 1920),
-            text_styles=text_styles if text_styles else None,
-            shadow_enabled=args.get("shadow_enabled", False),
-            shadow_color=args.get("shadow_color", "#000000"),
-            shadow_alpha=args.get("shadow_alpha", 0.8),
-            shadow_angle=args.get("shadow_angle", 315.0),
-            shadow_distance=args.get("shadow_distance", 5.0),
-            shadow_smoothing=args.get("shadow_smoothing", 0.0),
-            background_color=args.get("background_color"),
-            background_alpha=args.get("background_alpha", 1.0),
-            background_style=args.get("background_style", 0),
-            background_round_radius=args.get("background_round_radius", 0.0),
-        )
-
-        return {"success": True, "result": result}
-
-    def _add_subtitle(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """添加字幕到草稿"""
-        draft_id = args.get("draft_id")
-        if not draft_id or draft_id not in self.drafts:
-            return {"success": False, "error": "Invalid draft_id"}
-
-        draft_folder = self.drafts[draft_id]["folder"]
-
-        result = add_subtitle_impl(
-            draft_folder=draft_folder,
-            srt_path=args["srt_path"],
-            track_name=args.get("track_name", "subtitle"),
-            time_offset=args.get("time_offset", 0),
-            font=args.get("font"),
-            font_size=args.get("font_size", 8.0),
-            font_color=args.get("font_color", "#FFFFFF"),
-            bold=args.get("bold", False),
-            italic=args.get("italic", False),
-            underline=args.get("underline", False),
-            border_width=args.get("border_width", 0.0),
-            border_color=args.get("border_color", "#000000"),
-            background_color=args.get("background_color", "#000000"),
-            background_alpha=args.get("background_alpha", 0.0),
-            transform_x=args.get("transform_x", 0.0),
-            transform_y=args.get("transform_y", -0.8),
-            width=args.get("width", 1080),
-            height=args.get("height", 1920),
-        )
-
-        return {"success": True, "result": result}
+        return {
+            "success": all(r.get("success") for r in results),
+            "results": results,
+        }
 
-    def _add_effect(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """添加特效到草稿"""
+    def _save_draft(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """提交草稿保存任务，立即返回任务ID"""
         draft_id = args.get("draft_id")
-        if not draft_id or draft_id not in self.drafts:
+        index = self._draft_index.get(draft_id)
+        if index is None:
             return {"success": False, "error": "Invalid draft_id"}
 
-        draft_folder = self.drafts[draft_id]["folder"]
-
-        result = add_effect_impl(
-            draft_folder=draft_folder,
-            effect_type=args["effect_type"],
-            start=args.get("start", 0),
-            duration=args.get("end", 3.0) - args.get("start", 0),
-            track_name=args.get("track_name", "effect_01"),
-            params=args.get("params", []),
-            width=args.get("width", 1080),
-            height=args.get("height", 1920),
-        )
-
-        return {"success": True, "result": result}
+        def run_save():
+            with self._draft_lock(draft_id):
+                return _impl("save_draft_impl").save_draft_impl(
+                    draft_folder=self._folders[index], draft_id=draft_id
+                )
 
-    def _add_sticker(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """添加贴纸到草稿"""
-        draft_id = args.get("draft_id")
-        if not draft_id or draft_id not in self.drafts:
-            return {"success": False, "error": "Invalid draft_id"}
+        job_id = str(uuid.uuid4())
+        future = self._save_executor.submit(run_save)
+        with self._jobs_guard:
+            if len(self._jobs) >= _MAX_SAVE_JOBS:
+                # 清理一直未被查询的已结束任务
+                for finished_id in [k for k, f in self._jobs.items() if f.done()]:
+                    del self._jobs[finished_id]
+            self._jobs[job_id] = future
 
-        draft_folder = self.drafts[draft_id]["folder"]
-
-        result = add_sticker_impl(
-            draft_folder=draft_folder,
-            sticker_url=args["sticker_url"],
-            start=args.get("start", 0),
-            duration=args.get("end", 3.0) - args.get("start", 0),
-            width=args.get("width", 1080),
-            height=args.get("height", 1920),
-            transform_x=args.get("transform_x", 0),
-            transform_y=args.get("transform_y", 0),
-            scale_x=args.get("scale_x", 1),
-            scale_y=args.get("scale_y", 1),
-            rotation=args.get("rotation", 0),
-            track_name=args.get("track_name", "sticker_main"),
-        )
+        return {"success": True, "job_id": job_id, "status": "running"}
 
-        return {"success": True, "result": result}
+    def _get_save_status(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """查询草稿保存任务的状态"""
+        job_id = args.get("job_id")
+        with self._jobs_guard:
+            future = self._jobs.get(job_id)
+            # 已结束的任务只报告一次，之后从任务表中移除
+            if future is not None and future.done():
+                del self._jobs[job_id]
+        if future is None:
+            return {"success": False, "error": "Invalid job_id"}
 
-    def _save_draft(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """保存草稿"""
-        draft_id = args.get("draft_id")
-        if not draft_id or draft_id not in self.drafts:
-            return {"success": False, "error": "Invalid draft_id"}
+        if not future.done():
+            return {"success": True, "job_id": job_id, "status": "running"}
 
-        draft_folder = self.drafts[draft_id]["folder"]
-
-        result = save_draft_impl(draft_folder=draft_folder, draft_id=draft_id)
+        error = future.exception()
+        if error is not None:
+            return {
+                "success": False,
+                "job_id": job_id,
+                "status": "failed",
+                "error": str(error),
+            }
 
-        return {"success": True, "result": result}
+        return {
+            "success": True,
+            "job_id": job_id,
+            "status": "done",
+            "result": future.result(),
+        }
 
 
 # 主函数
 if __name__ == "__main__":
-    import asyncio
     import mcp.types as types
-    from mcp.server.models import InitializationOptions
-    import mcp.server.stdio
+    from mcp.server import Server
+    from mcp.server.stdio import stdio_server
+
+    # 优先使用uvloop事件循环，工具调用本身已在线程中执行
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
 
     server = CapCutMCPServer()
+    mcp_app = Server(server.name)
+    tool_models = server.get_tool_models()
 
-    @mcp.server.stdio.server()
+    @mcp_app.list_tools()
+    async def handle_list_tools() -> List[types.Tool]:
+        """列出可用工具"""
+        return tool_models
+
+    @mcp_app.call_tool()
     async def handle_call_tool(
-        name: str, arguments: Optional[Dict[str, Any]] = None
+        name: str, arguments: Optional[Dict[str, Any]]
     ) -> List[types.TextContent]:
         """处理工具调用"""
-        if name == "create_draft":
-            result = server.call_tool("create_draft", arguments or {})
-            return [
-                types.TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False)
-                )
-            ]
-        elif name == "add_video":
-            result = server.call_tool("add_video", arguments or {})
-            return [
-                types.TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False)
-                )
-            ]
-        elif name == "add_audio":
-            result = server.call_tool("add_audio", arguments or {})
-            return [
-                types.TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False)
-                )
-            ]
-        elif name == "add_image":
-            result = server.call_tool("add_image", arguments or {})
-            return [
-                types.TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False)
-                )
-            ]
-        elif name == "add_text":
-            result = server.call_tool("add_text", arguments or {})
-            return [
-                types.TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False)
-                )
-            ]
-        elif name == "add_subtitle":
-            result = server.call_tool("add_subtitle", arguments or {})
-            return [
-                types.TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False)
-                )
-            ]
-        elif name == "add_effect":
-            result = server.call_tool("add_effect", arguments or {})
-            return [
-                types.TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False)
-                )
-            ]
-        elif name == "add_sticker":
-            result = server.call_tool("add_sticker", arguments or {})
-            return [
-                types.TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False)
-                )
-            ]
-        elif name == "save_draft":
-            result = server.call_tool("save_draft", arguments or {})
-            return [
-                types.TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False)
-                )
-            ]
-        else:
-            return [
-                types.TextContent(
-                    type="text", text=json.dumps({"error": f"Unknown tool: {name}"})
-                )
-            ]
+        text = await server.call_tool_json_async(name, arguments or {})
+        # 内容由服务端生成，跳过pydantic校验
+        return [types.TextContent.model_construct(type="text", text=text)]
 
-    @mcp.server.stdio.server()
-    async def handle_list_tools() -> List[types.Tool]:
-        """列出可用工具"""
-        tools = server.get_tools()
-        return [types.Tool(**tool) for tool in tools]
+    # 初始化选项依赖已注册的处理函数，在注册完成后构建
+    init_options = mcp_app.create_initialization_options()
+
+    async def main() -> None:
+        # Server.run 在一个会话内逐个处理请求：工具调用放到线程池中执行只是不阻塞
+        # 事件循环，同一会话内的多个调用仍按顺序执行
+        async with stdio_server() as (read_stream, write_stream):
+            await mcp_app.run(read_stream, write_stream, init_options)
 
     # 运行服务器
-    asyncio.run(
-        mcp.server.stdio.run(
-            handle_call_tool,
-            handle_list_tools,
-            InitializationOptions(
-                server_name="capcut-api",
-                server_version="1.0.0",
-            ),
-        )
-    )
+    asyncio.run(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+CapCut API MCP Server (Daemon Mode)
+
+常驻进程模式：守护进程在Unix socket上提供MCP服务，客户端仅负责转发stdio，
+避免每次启动MCP时重复加载解释器和CapCut模块
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Dict, Optional
+
+DEFAULT_SOCKET_PATH = os.getenv("CAPCUT_MCP_SOCKET", "/tmp/capcut-mcp.sock")
+
+# 与stdio版本的MCP协议保持一致
+PROTOCOL_VERSION = "2024-11-05"
+
+# 单条JSON-RPC消息的长度上限，asyncio默认的64 KiB容不下较大的批量请求
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+async def _discard_line(reader: asyncio.StreamReader) -> None:
+    """丢弃超长消息的剩余部分，直到下一个换行符或连接结束"""
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+def _error_response(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    """构造JSON-RPC错误响应"""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+async def daemon_main(socket_path: str = DEFAULT_SOCKET_PATH) -> None:
+    """启动守护进程，所有连接共享同一个CapCutMCPServer实例"""
+    # 已有守护进程在监听时直接退出，避免抢占其socket
+    if os.path.exists(socket_path):
+        try:
+            _, probe = await asyncio.open_unix_connection(socket_path)
+        except ConnectionRefusedError:
+            # 之前的守护进程已退出，只留下socket文件
+            os.unlink(socket_path)
+        else:
+            probe.close()
+            sys.exit(f"CapCut MCP daemon is already running on {socket_path}")
+
+    from mcp_server import CapCutMCPServer, json_dumps_bytes, preload_impls
+
+    # 常驻进程只加载一次，启动时预先导入全部模块
+    preload_impls()
+    server = CapCutMCPServer()
+    tools_json = server.get_tools_json()
+
+    async def handle_request(message: Dict[str, Any]) -> Optional[bytes]:
+        """处理单条JSON-RPC消息，通知类消息不返回响应"""
+        request_id = message.get("id")
+        method = message.get("method")
+        if request_id is None:
+            return None
+
+        if method == "tools/list":
+            # 工具列表已预先序列化，直接拼接
+            return (
+                b'{"jsonrpc":"2.0","id":'
+                + json_dumps_bytes(request_id)
+                + b',"result":{"tools":'
+                + tools_json
+                + b"}}"
+            )
+
+        if method == "tools/call":
+            params = message.get("params") or {}
+            text = await server.call_tool_json_async(
+                params.get("name"), params.get("arguments") or {}
+            )
+            response = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "result": {"content": [{"type": "text", "text": text}]},
+            }
+        elif method == "initialize":
+            params = message.get("params") or {}
+            response = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "result": {
+                    "protocolVersion": params.get("protocolVersion", PROTOCOL_VERSION),
+                    "capabilities": {"tools": {}},
+                    "serverInfo": {"name": server.name, "version": server.version},
+                },
+            }
+        elif method == "ping":
+            response = {"jsonrpc": "2.0", "id": request_id, "result": {}}
+        else:
+            response = _error_response(
+                request_id, -32601, f"Method not found: {method}"
+            )
+
+        return json_dumps_bytes(response)
+
+    async def handle_connection(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """处理一个客户端连接，连接内的请求并发执行"""
+        pending = set()
+
+        async def respond(message: Dict[str, Any]) -> None:
+            try:
+                body = await handle_request(message)
+            except Exception as e:
+                body = json_dumps_bytes(
+                    _error_response(message.get("id"), -32603, str(e))
+                )
+            if body is not None:
+                writer.write(body + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    # 连接结束，处理最后一条不带换行符的消息
+                    line = e.partial
+                    if not line:
+                        break
+                except asyncio.LimitOverrunError:
+                    await _discard_line(reader)
+                    error = _error_response(
+                        None,
+                        -32600,
+                        f"Invalid Request: message exceeds {MAX_MESSAGE_BYTES} bytes",
+                    )
+                    writer.write(json_dumps_bytes(error) + b"\n")
+                    await writer.drain()
+                    continue
+
+                if not line.strip():
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError as e:
+                    message = None
+                    error = _error_response(None, -32700, f"Parse error: {e}")
+                else:
+                    error = _error_response(None, -32600, "Invalid Request")
+                if not isinstance(message, dict):
+                    writer.write(json_dumps_bytes(error) + b"\n")
+                    await writer.drain()
+                    continue
+
+                task = asyncio.create_task(respond(message))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            writer.close()
+
+    unix_server = await asyncio.start_unix_server(
+        handle_connection, path=socket_path, limit=MAX_MESSAGE_BYTES
+    )
+    os.chmod(socket_path, 0o600)
+    print(f"CapCut MCP daemon listening on {socket_path}", file=sys.stderr)
+
+    async with unix_server:
+        await unix_server.serve_forever()
+
+
+async def client_main(socket_path: str = DEFAULT_SOCKET_PATH) -> None:
+    """连接守护进程，在stdio与Unix socket之间转发JSON-RPC消息"""
+    loop = asyncio.get_running_loop()
+    try:
+        reader, writer = await asyncio.open_unix_connection(
+            socket_path, limit=MAX_MESSAGE_BYTES
+        )
+    except (FileNotFoundError, ConnectionRefusedError):
+        sys.exit(
+            f"CapCut MCP daemon is not running on {socket_path}; "
+            "start it with: python mcp_server_daemon.py --daemon"
+        )
+
+    stdin = asyncio.StreamReader(limit=MAX_MESSAGE_BYTES)
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(stdin), sys.stdin
+    )
+
+    # 客户端只做字节转发，按块读取而不是按行，消息长度不受缓冲区上限影响
+    async def forward_stdin() -> None:
+        while chunk := await stdin.read(65536):
+            writer.write(chunk)
+            await writer.drain()
+        writer.write_eof()
+
+    async def forward_socket() -> None:
+        while chunk := await reader.read(65536):
+            sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+
+    await asyncio.gather(forward_stdin(), forward_socket())
+    writer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CapCut API MCP daemon")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--daemon", action="store_true", help="启动常驻守护进程")
+    mode.add_argument("--client", action="store_true", help="以stdio客户端方式连接守护进程")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket路径")
+    cli_args = parser.parse_args()
+
+    if cli_args.daemon:
+        try:
+            import uvloop
+
+            uvloop.install()
+        except ImportError:
+            pass
+
+        asyncio.run(daemon_main(cli_args.socket))
+    else:
+        asyncio.run(client_main(cli_args.socket))
@@ -1,13 +1,37 @@
+import asyncio
+import os
+
+import orjson
 import uvicorn
-import json
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from mcp.server import Server
 from mcp.server.sse import SseServerTransport
 import mcp.types as types
 from mcp_server import CapCutMCPServer
 
-# 初始化 FastAPI 应用
-app = FastAPI()
+try:
+    import ormsgpack
+except ImportError:
+    ormsgpack = None
+
+# 客户端消息可使用MessagePack编码的Content-Type
+_MSGPACK_CONTENT_TYPES = (b"application/msgpack", b"application/x-msgpack")
+
+# 初始化 FastAPI 应用，JSON响应统一使用orjson序列化
+app = FastAPI(default_response_class=ORJSONResponse)
+
+
+async def handle_exception(request, exc: Exception) -> ORJSONResponse:
+    """未捕获的异常同样用orjson渲染错误响应
+
+    异常详情不返回给客户端，避免泄露路径等内部信息；Starlette 返回响应后会重新抛出异常，
+    由 uvicorn 的错误日志记录完整的调用栈
+    """
+    return ORJSONResponse({"error": "Internal Server Error"}, status_code=500)
+
+
+app.add_exception_handler(Exception, handle_exception)
 
 # 初始化 CapCut 逻辑服务
 capcut_svc = CapCutMCPServer()
@@ -16,40 +40,226 @@ capcut_svc = CapCutMCPServer()
 mcp_server = Server("capcut-api")
 
 # 初始化 SSE 传输层
-sse = SseServerTransport("/messages")
+sse = SseServerTransport("/messages/")
+
+# 工具列表在进程生命周期内不变，只构建一次
+_TOOLS_CACHE = capcut_svc.get_tool_models()
 
 
 @mcp_server.list_tools()
 async def list_tools() -> list[types.Tool]:
     """列出可用工具"""
-    return [types.Tool(**t) for t in capcut_svc.get_tools()]
+    return _TOOLS_CACHE
 
 
 @mcp_server.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     """调用工具"""
-    # 复用 CapCutMCPServer 的 call_tool 逻辑
-    result = capcut_svc.call_tool(name, arguments)
-    return [types.TextContent(type="text", text=json.dumps(result, ensure_ascii=False))]
-
-
-@app.get("/sse")
-async def handle_sse(request: Request):
-    """处理 SSE 连接"""
-    async with sse.connect_sse(
-        request.scope, request.receive, request._send
-    ) as streams:
-        await mcp_server.run(
-            streams[0], streams[1], mcp_server.create_initialization_options()
+    # 复用 CapCutMCPServer 的 call_tool 逻辑，在线程池中执行，不阻塞事件循环
+    # 结果在工作线程中完成序列化
+    text = await capcut_svc.call_tool_json_async(name, arguments)
+    return [types.TextContent.model_construct(type="text", text=text)]
+
+
+# 初始化选项依赖已注册的处理函数，在注册完成后构建一次，所有 SSE 连接共用
+INIT_OPTS = mcp_server.create_initialization_options()
+
+
+class CoalescingSend:
+    """合并短时间窗口内的 SSE 写入
+
+    传输层每发出一个事件就调用一次 send，突发的工具调用结果会产生大量小块写入；
+    这里把窗口期内的事件字节拼接成一个 http.response.body 消息再发出。
+    每个事件仍是完整的SSE帧，客户端看到的事件序列不变
+    """
+
+    def __init__(self, send, window: float = 0.001, max_bytes: int = 64 * 1024):
+        self._send = send
+        self._window = window
+        self._max_bytes = max_bytes
+        self._buffer: list[bytes] = []
+        self._size = 0
+        self._lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._error: Exception | None = None
+
+    async def __call__(self, message) -> None:
+        if self._error is not None:
+            raise self._error
+
+        if message["type"] == "http.response.body" and message.get("more_body"):
+            async with self._lock:
+                body = message.get("body", b"")
+                self._buffer.append(body)
+                self._size += len(body)
+                if self._size >= self._max_bytes:
+                    await self._flush()
+                    return
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_later())
+            return
+
+        # 响应头和最后一块响应体之前先把缓冲区写出，保证顺序
+        async with self._lock:
+            await self._flush()
+            await self._send(message)
+
+    async def _flush(self) -> None:
+        """写出缓冲区内容，调用方需持有锁"""
+        if not self._buffer:
+            return
+        body = b"".join(self._buffer)
+        self._buffer.clear()
+        self._size = 0
+        await self._send(
+            {"type": "http.response.body", "body": body, "more_body": True}
+        )
+
+    async def _flush_later(self) -> None:
+        """等待一个时间窗口后写出缓冲区，写入失败时留给下一次 send 抛出"""
+        await asyncio.sleep(self._window)
+        try:
+            async with self._lock:
+                self._flush_task = None
+                await self._flush()
+        except Exception as e:
+            self._error = e
+
+    def close(self) -> None:
+        """取消尚未执行的延迟写出"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+
+class SseEndpoint:
+    """处理 SSE 连接的原生ASGI端点
+
+    SSE传输层需要直接持有ASGI的 receive/send 通道，
+    以类的形式注册路由时 Starlette 会原样传入，不再需要访问 Request 的私有属性
+    """
+
+    async def __call__(self, scope, receive, send):
+        coalescing_send = CoalescingSend(send)
+        try:
+            async with sse.connect_sse(scope, receive, coalescing_send) as streams:
+                await mcp_server.run(streams[0], streams[1], INIT_OPTS)
+        finally:
+            coalescing_send.close()
+
+
+app.add_route("/sse", SseEndpoint(), methods=["GET"])
+
+
+def _replay_body(body: bytes, receive):
+    """构造一个先返回给定请求体、之后再转交原始通道的 receive"""
+    sent = False
+
+    async def replay():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+async def _read_body(receive) -> bytes:
+    """从ASGI通道读取完整请求体"""
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+async def handle_messages(scope, receive, send):
+    """处理客户端消息
+
+    JSON请求体直接交给 SSE 传输层解析，只捕获其解析失败，返回 400 而不是 500；
+    请求体为MessagePack时先解码并转为JSON，再交给 SSE 传输层；
+    服务端消息仍通过SSE以JSON下发
+
+    MessagePack只减少上行的传输字节数：服务端要先解码、再编码为JSON、
+    最后由传输层解析，CPU开销高于直接发送JSON，仅适合带宽受限的客户端
+    """
+    headers = dict(scope.get("headers") or ())
+    content_type = headers.get(b"content-type", b"").split(b";")[0].strip()
+    if content_type in _MSGPACK_CONTENT_TYPES:
+        if ormsgpack is None:
+            response = ORJSONResponse(
+                {"error": "MessagePack support is not installed"}, status_code=415
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            message = ormsgpack.unpackb(await _read_body(receive))
+        except ValueError as e:
+            response = ORJSONResponse(
+                {"error": f"Invalid MessagePack body: {e}"}, status_code=400
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            # 严格编码：bin、非字符串键等无法用JSON表示的值直接拒绝，不做字符串化
+            body = orjson.dumps(message)
+        except orjson.JSONEncodeError as e:
+            response = ORJSONResponse(
+                {"error": f"MessagePack body is not representable as JSON: {e}"},
+                status_code=400,
+            )
+            await response(scope, receive, send)
+            return
+
+        headers[b"content-type"] = b"application/json"
+        headers[b"content-length"] = str(len(body)).encode("ascii")
+        scope = dict(scope, headers=list(headers.items()))
+        receive = _replay_body(body, receive)
+
+    response_started = False
+
+    async def tracked_send(message) -> None:
+        nonlocal response_started
+        if message["type"] == "http.response.start":
+            response_started = True
+        await send(message)
+
+    try:
+        await sse.handle_post_message(scope, receive, tracked_send)
+    except ValueError as e:
+        # 传输层用 request.json() 解析请求体，格式错误时抛出 ValueError
+        if response_started:
+            raise
+        response = ORJSONResponse(
+            {"error": f"Invalid JSON body: {e}"}, status_code=400
         )
+        await response(scope, receive, send)
 
 
-@app.post("/messages")
-async def handle_messages(request: Request):
-    """处理客户端消息"""
-    await sse.handle_post_message(request.scope, request.receive, request._send)
+# 客户端消息直接交给 ASGI 应用处理，
+# 不经过 FastAPI 的路由函数和响应序列化（传输层自行返回 202 响应）
+app.mount("/messages/", app=handle_messages)
 
 
 if __name__ == "__main__":
-    # 启动服务器，监听 5001 端口
-    uvicorn.run(app, host="0.0.0.0", port=5001)
+    # 启动服务器，监听 5001 端口；已安装 uvloop 和 httptools 时自动使用
+    # SSE会话和草稿状态保存在进程内，只能单进程运行；扩展时启动多个实例，
+    # 由反向代理按客户端固定转发（见 nginx/mcp-sse.conf）
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=5001,
+        # 设置后改为监听Unix socket，供同机的反向代理转发
+        uds=os.getenv("MCP_SSE_UDS") or None,
+        # 事件循环可通过环境变量指定（auto / uvloop / asyncio）
+        loop=os.getenv("MCP_SSE_LOOP", "auto"),
+        http="auto",
+        # 关闭访问日志，日志级别可通过环境变量调整
+        access_log=False,
+        log_level=os.getenv("MCP_SSE_LOG_LEVEL", "warning"),
+    )
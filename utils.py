@@ -18,12 +18,36 @@ from datetime import datetime, timedelta
 import time
 import re
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse, unquote
 import zipfile
 import tarfile
 
 logger = logging.getLogger(__name__)
 
+def create_http_session(pool_connections: int = 16, pool_maxsize: int = 32) -> requests.Session:
+    """创建带连接池的HTTP会话"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    })
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# 全局共享的HTTP会话，在多次下载之间复用TCP/TLS连接
+http_session = create_http_session()
+
+# 远程素材的本地缓存目录
+MEDIA_CACHE_DIR = os.getenv(
+    "CAPCUT_MEDIA_CACHE_DIR", str(Path.home() / ".cache" / "capcutapi")
+)
+# 素材缓存目录的容量上限（字节），超出后按最近使用时间淘汰
+MEDIA_CACHE_MAX_BYTES = int(
+    os.getenv("CAPCUT_MEDIA_CACHE_MAX_BYTES", str(2 * 1024 ** 3))
+)
+
 class FileUtils:
     """文件操作工具类"""
     
@@ -233,14 +257,9 @@ class URLUtils:
             
             FileUtils.ensure_dir(str(Path(output_path).parent))
             
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            
             for attempt in range(max_retries):
                 try:
-                    response = session.get(url, timeout=timeout, stream=True)
+                    response = http_session.get(url, timeout=timeout, stream=True)
                     response.raise_for_status()
                     
                     total_size = int(response.headers.get('content-length', 0))
@@ -268,11 +287,109 @@ class URLUtils:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    @staticmethod
+    def fetch_cached(url: str, cache_dir: Optional[str] = None,
+                     default_ext: str = '') -> str:
+        """下载URL到本地缓存并返回本地路径，已缓存的URL不再重复下载
+        
+        URL路径没有可用的扩展名时（如CDN或签名链接）使用default_ext
+        """
+        if not url.startswith(('http://', 'https://')):
+            return url
+        
+        cache_dir = cache_dir or MEDIA_CACHE_DIR
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
+        ext = Path(urlparse(url).path).suffix
+        if not re.fullmatch(r'\.[A-Za-z0-9]{1,8}', ext):
+            ext = default_ext
+        cache_path = os.path.join(cache_dir, f"{digest}{ext}")
+        if os.path.exists(cache_path):
+            # 更新修改时间，淘汰时按最近使用排序
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return cache_path
+        
+        FileUtils.ensure_dir(cache_dir)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.part')
+        try:
+            # mkstemp创建的文件仅所有者可读，链接到草稿后需与普通下载文件权限一致
+            os.chmod(tmp_path, 0o644)
+            with os.fdopen(fd, 'wb') as f:
+                with http_session.get(url, stream=True, timeout=30) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+            # 原子替换，并发下载同一URL时不会读到不完整的文件
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        logger.info(f"Cached {url} -> {cache_path}")
+        URLUtils.prune_cache(cache_dir, keep=cache_path)
+        return cache_path
+    
+    @staticmethod
+    def prune_cache(cache_dir: str, max_bytes: Optional[int] = None,
+                    keep: Optional[str] = None) -> int:
+        """缓存目录超出容量上限时删除最久未使用的文件，返回删除的文件数"""
+        max_bytes = MEDIA_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        entries = []
+        total = 0
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if not entry.is_file() or entry.name.endswith('.part'):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+    
+    @staticmethod
+    def link_or_copy(src: str, dest_dir: str) -> str:
+        """将文件硬链接到目标目录，无法链接时（如跨文件系统）复制，返回目标路径"""
+        FileUtils.ensure_dir(dest_dir)
+        dest = os.path.join(dest_dir, os.path.basename(src))
+        if os.path.exists(dest):
+            return dest
+        
+        try:
+            os.link(src, dest)
+        except FileExistsError:
+            pass
+        except OSError:
+            fd, tmp_path = tempfile.mkstemp(dir=dest_dir, suffix='.part')
+            os.close(fd)
+            try:
+                shutil.copy2(src, tmp_path)
+                os.replace(tmp_path, dest)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return dest
+    
     @staticmethod
     def get_url_info(url: str) -> Dict[str, Any]:
         """获取URL信息"""
         try:
-            response = requests.head(url, timeout=10)
+            response = http_session.head(url, timeout=10)
             return {
                 "url": url,
                 "status_code": response.status_code,
@@ -622,6 +739,17 @@ def download_file_from_url(url: str, output_path: str, **kwargs) -> Dict[str, An
     """快捷文件下载"""
     return URLUtils.download_file(url, output_path, **kwargs)
 
+def cached_fetch(url: str, default_ext: str = '') -> str:
+    """快捷缓存下载"""
+    return URLUtils.fetch_cached(url, default_ext=default_ext)
+
+def fetch_into(url: str, dest_dir: str, default_ext: str = '') -> str:
+    """快捷下载到指定目录：远程URL经缓存去重后链接到目标目录，本地路径原样返回"""
+    cache_path = URLUtils.fetch_cached(url, default_ext=default_ext)
+    if cache_path == url:
+        return url
+    return URLUtils.link_or_copy(cache_path, dest_dir)
+
 def sanitize_filename(filename: str) -> str:
     """快捷文件名清理"""
     return StringUtils.sanitize_filename(filename)